@@ -2,24 +2,32 @@
 
 import logging
 import os
+import queue
 import string
+import subprocess
 import sys
+import time
 import traceback
 import wave
+from collections import OrderedDict
+from multiprocessing.connection import Client
 from pathlib import Path
-import pickle
+from types import SimpleNamespace
 import threading
 
-import keyboard
-import pyaudio
-from PySide6.QtCore import QThread, Signal, Property, QPropertyAnimation, QEasingCurve
+import numpy as np
+from PySide6.QtCore import (
+    QObject, QRunnable, QThread, QThreadPool, QTimer, Signal, Property, QPropertyAnimation, QEasingCurve
+)
+from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QMessageBox, QWidget, QVBoxLayout, 
     QHBoxLayout, QPushButton, QLabel, QComboBox, QLineEdit, QTextEdit, 
-    QGridLayout, QFrame, QDialog, QProgressBar
+    QGridLayout, QFrame, QDialog, QProgressBar, QCheckBox
 )
 
-from faster_whisper import WhisperModel
+# faster_whisper, pyaudio, keyboard and numba are imported where they are first used
+# so the window can paint before their (slow) initialization runs.
 
 import json
 
@@ -30,31 +38,223 @@ def load_config():
     return config
 
 def save_config(new_config):
+    # Write to a temp file and swap it in so a crash never leaves a truncated config.json
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-    with open(config_path, 'w') as config_file:
+    tmp_path = config_path + '.tmp'
+    with open(tmp_path, 'w') as config_file:
         json.dump(new_config, config_file, indent=4)
+    os.replace(tmp_path, config_path)
 
 config = load_config()
 
 from theme_manager import ThemeManager
 
+WHISPER_SAMPLE_RATE = 16000
+SMALL_MODELS = ("tiny", "base")
+SHORT_CLIP_SECONDS = 15
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+def _strip_punctuation(text):
+    return text.translate(_PUNCT_TABLE)
+
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+class AudioEngine:
+    """
+    Process-wide PyAudio instance. Input streams are paused between recordings and reused.
+    """
+    _instance = None
+    _lock = threading.Lock()
+    _streams = {}
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    import pyaudio
+                    cls._instance = pyaudio.PyAudio()
+        return cls._instance
+
+    @staticmethod
+    def _make_callback(frame_queue):
+        import pyaudio
+        def callback(in_data, frame_count, time_info, status):
+            frame_queue.put((in_data, status))
+            return (None, pyaudio.paContinue)
+        return callback
+
+    @classmethod
+    def open_input(cls, device_index, audio_format, channels, rate, chunk):
+        """
+        Return a started (stream, queue) pair for the device, reopening only when the settings change.
+        """
+        # Values may come from config/QLineEdit as strings or floats; PortAudio needs ints
+        channels, rate, chunk = int(channels), int(rate), int(chunk)
+        key = (device_index, audio_format, channels, rate, chunk)
+        with cls._lock:
+            entry = cls._streams.get(key)
+            if entry is None:
+                # Close the device's stream for the old settings first; exclusive host APIs
+                # (e.g. ALSA hw:) refuse a second open of the same device
+                for stale_key in [k for k in cls._streams if k[0] == device_index]:
+                    stale_stream, _ = cls._streams.pop(stale_key)
+                    try:
+                        stale_stream.close()
+                    except Exception as e:
+                        logger.warning("Failed to close audio stream: %s", e)
+                frame_queue = queue.SimpleQueue()
+                stream = cls.get_instance().open(
+                    format=audio_format,
+                    channels=channels,
+                    rate=rate,
+                    input=True,
+                    frames_per_buffer=chunk,
+                    input_device_index=device_index,
+                    stream_callback=cls._make_callback(frame_queue),
+                    start=False
+                )
+                entry = cls._streams[key] = (stream, frame_queue)
+
+        stream, frame_queue = entry
+        # Släng chunks som hann komma in efter förra stoppet
+        while not frame_queue.empty():
+            frame_queue.get_nowait()
+        try:
+            stream.start_stream()
+        except Exception:
+            cls.discard(stream)
+            raise
+        return entry
+
+    @classmethod
+    def release(cls, stream):
+        if stream.is_active():
+            stream.stop_stream()
+
+    @classmethod
+    def discard(cls, stream):
+        with cls._lock:
+            for key, (cached, _) in list(cls._streams.items()):
+                if cached is stream:
+                    del cls._streams[key]
+        try:
+            stream.close()
+        except Exception as e:
+            logger.warning(f"Failed to close audio stream: {e}")
+
+    @classmethod
+    def terminate(cls):
+        with cls._lock:
+            for stream, _ in cls._streams.values():
+                stream.close()
+            cls._streams.clear()
+            if cls._instance is not None:
+                cls._instance.terminate()
+                cls._instance = None
+
 def list_input_devices():
     """
     Lista alla tillgängliga inmatningsenheter (mikrofoner och virtuella ljudenheter).
     """
-    p = pyaudio.PyAudio()
+    p = AudioEngine.get_instance()
+    # Valfritt: visa bara enheter från ett visst host-API, t.ex. "WASAPI" eller "Core Audio"
+    host_api = config.get("host_api")
     device_list = []
     for i in range(p.get_device_count()):
         device = p.get_device_info_by_index(i)
-        if device['maxInputChannels'] > 0:
-            device_list.append((i, device['name']))
-    p.terminate()
+        if device['maxInputChannels'] <= 0:
+            continue
+        if host_api:
+            api_name = p.get_host_api_info_by_index(device['hostApi'])['name']
+            if host_api.lower() not in api_name.lower():
+                continue
+        device_list.append((i, device['name']))
     return device_list
 
+class DeviceListSignals(QObject):
+    devices_listed = Signal(list)
+
+class DeviceListWorker(QRunnable):
+    """
+    Enumerate input devices off the GUI thread.
+    """
+    def __init__(self):
+        super().__init__()
+        self.signals = DeviceListSignals()
+
+    def run(self):
+        try:
+            self.signals.devices_listed.emit(list_input_devices())
+        except Exception as e:
+            logger.error(f"Error listing input devices: {e}")
+
+class RemoteModel:
+    """
+    Stand-in for WhisperModel that forwards transcription to the model server process.
+    """
+    _launch_lock = threading.Lock()
+    CONNECT_TIMEOUT = 30.0
+
+    def __init__(self, model_name, device, compute_type, cache_dir):
+        self.model_key = (model_name, device, compute_type)
+        self.address = ("localhost", config.get("model_server_port", 6000))
+        self.key_file = cache_dir / "model_server.key"
+        self._request(("load", *self.model_key))
+
+    def transcribe(self, audio, **options):
+        # The detached server has its own working directory, so file paths must be absolute
+        if isinstance(audio, str):
+            audio = os.path.abspath(audio)
+        texts = self._request(("transcribe", self.model_key, audio, options))
+        return [SimpleNamespace(text=text) for text in texts], None
+
+    def _connect(self):
+        from model_server import load_authkey
+        authkey = load_authkey(self.key_file)
+        try:
+            return Client(self.address, authkey=authkey)
+        except ConnectionRefusedError:
+            pass
+
+        with self._launch_lock:
+            try:
+                return Client(self.address, authkey=authkey)
+            except ConnectionRefusedError:
+                self._launch_server()
+            deadline = time.monotonic() + self.CONNECT_TIMEOUT
+            while True:
+                try:
+                    return Client(self.address, authkey=authkey)
+                except ConnectionRefusedError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.2)
+
+    def _launch_server(self):
+        # The server is detached so it outlives the GUI and keeps models warm across restarts
+        server_path = os.path.join(os.path.dirname(__file__), 'model_server.py')
+        if os.name == 'nt':
+            options = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            options = {"start_new_session": True}
+        subprocess.Popen(
+            [sys.executable, server_path, str(self.address[1]), str(self.key_file)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            **options
+        )
+        logger.debug("Model server launched on port %s.", self.address[1])
+
+    def _request(self, request):
+        with self._connect() as conn:
+            conn.send(request)
+            status, result = conn.recv()
+        if status == "error":
+            raise RuntimeError(f"Model server error: {result}")
+        return result
+
 class ModelCache:
     _instance = None
     _lock = threading.Lock()
@@ -67,79 +267,329 @@ class ModelCache:
                     cls._instance = cls()
         return cls._instance
 
+    _hardware = None
+
     def __init__(self):
-        self.cache = {}
+        # Least recently used first; bounded so switching models doesn't pile up weights
+        self.cache = OrderedDict()
+        self.capacity = max(1, config.get("model_cache_size", 3))
+        self._last = (None, None, None)
+        self._last_used = {}
+        self._active = None
+        # Runtime statistic only, not persisted: the average starts over each session
+        self.avg_clip_seconds = None
+        self._manifest_lock = threading.Lock()
+        self._key_locks = {}
+        self._warmed = set()
+        self.stats = {"hits": 0, "misses": 0}
+        self._model_lock = threading.Lock()
         self.initialize_cache_dir()
 
+    @classmethod
+    def detect_hardware(cls):
+        """
+        Probe CUDA once per process and return (has_cuda, best CUDA compute_type).
+        """
+        if cls._hardware is None:
+            has_cuda, cuda_compute_type = False, None
+            try:
+                import ctranslate2
+                if ctranslate2.get_cuda_device_count() > 0:
+                    has_cuda = True
+                    # float16 and int8_float16 both need compute capability >= 7.0; older GPUs get int8 or float32
+                    supported = ctranslate2.get_supported_compute_types("cuda")
+                    cuda_compute_type = next(
+                        (t for t in ("int8_float16", "float16", "int8") if t in supported), "float32"
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to probe CUDA devices: {e}")
+            cls._hardware = (has_cuda, cuda_compute_type)
+            logger.debug("Hardware probe: cuda=%s, compute_type=%s", has_cuda, cuda_compute_type)
+        return cls._hardware
+
+    def resolve_settings(self, device: str, compute_type: str, model_name: str = None):
+        """
+        Replace "auto" device/compute_type with the values best suited for this machine.
+        """
+        has_cuda, cuda_compute_type = self.detect_hardware()
+        if device in (None, "auto"):
+            device = "cuda" if has_cuda and not self.prefers_cpu(model_name) else "cpu"
+        if compute_type in (None, "auto"):
+            compute_type = cuda_compute_type if device == "cuda" and cuda_compute_type else "int8"
+        return device, compute_type
+
     def initialize_cache_dir(self):
         cache_dir = Path(config.get("cache_dir", ".whisper_cache"))
-        cache_dir = Path.home() / cache_dir if not Path(config.get("cache_dir")).is_absolute() else Path(config.get("cache_dir"))
+        if not cache_dir.is_absolute():
+            cache_dir = Path.home() / cache_dir
         cache_dir.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Cache directory set to: {cache_dir}")
+        logger.debug("Cache directory set to: %s", cache_dir)
         self.cache_dir = cache_dir
-        self.cache_file = cache_dir / config.get("cache_file", "model_cache_metadata.pkl")
+        self.manifest_file = cache_dir / "manifest.json"
 
-    def get_model(self, model_name: str, device: str, compute_type: str):
-        cache_key = f"{model_name}_{device}_{compute_type}"
+    def load_manifest(self):
+        """
+        Return the list of previously used [model_name, device, compute_type] triples, oldest first.
+        """
+        try:
+            with open(self.manifest_file, 'r') as f:
+                return [tuple(entry) for entry in json.load(f)]
+        except FileNotFoundError:
+            return []
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Failed to read model manifest: {e}")
+            return []
+
+    def recent(self):
+        """
+        Return the triples used in earlier sessions, most recent first.
+        """
+        return self.load_manifest()[::-1]
+
+    def record_usage(self, model_name: str, device: str, compute_type: str):
+        """
+        Move the triple to the end of the manifest and write it atomically.
+        """
+        entry = (model_name, device, compute_type)
+        manifest = [e for e in self.load_manifest() if e != entry]
+        manifest.append(entry)
+        tmp_file = self.manifest_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump([list(e) for e in manifest], f, indent=4)
+            os.replace(tmp_file, self.manifest_file)
+            logger.debug("Model manifest saved to '%s'.", self.manifest_file)
+        except OSError as e:
+            logger.warning(f"Failed to save model manifest: {e}")
+
+    def mark_active(self, model_name: str, device: str, compute_type: str):
+        """
+        Remember the model the GUI switched to; returns True if the manifest needs saving.
+        """
+        entry = (model_name, *self.resolve_settings(device, compute_type, model_name))
+        if entry == self._active:
+            return False
+        self._active = entry
+        return True
+
+    def save_active(self):
+        # Runs on the pool; always writes the latest selection, so out-of-order runs are harmless
+        with self._manifest_lock:
+            if self._active is not None:
+                self.record_usage(*self._active)
+
+    def prefers_cpu(self, model_name):
+        """
+        Small models on short clips finish faster on CPU than the GPU transfer/launch overhead allows.
+        """
+        if not model_name or not model_name.startswith(SMALL_MODELS):
+            return False
+        return self._clips_are_short()
 
-        # Try to load from memory cache first
-        if cache_key in self.cache:
-            logger.debug(f"Model '{cache_key}' loaded from memory cache.")
-            return self.cache[cache_key]
+    def _clips_are_short(self):
+        return self.avg_clip_seconds is None or self.avg_clip_seconds < SHORT_CLIP_SECONDS
 
-        # Check for an existing metadata file
-        if self.cache_file.exists() and os.path.getsize(self.cache_file) > 0:  # Check file size
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    metadata = pickle.load(f)
-                    if cache_key in metadata:
-                        logger.debug(f"Metadata for model '{cache_key}' loaded from disk cache.")
-                        # Recreate the model based on metadata
-                        model = WhisperModel(model_name, device=device, compute_type=compute_type)
-                        self.cache[cache_key] = model
-                        return model
-            except (EOFError, pickle.UnpicklingError) as e:
-                logger.warning(f"Failed to load model metadata: {e}")
-                # Optionally, recreate the metadata file if it's corrupted
-                os.remove(self.cache_file)  # Delete corrupted cache file
-
-        # Create new model if not found in cache
-        model = WhisperModel(model_name, device=device, compute_type=compute_type)
-        self.cache[cache_key] = model
-        logger.debug(f"Model '{cache_key}' created and added to cache.")
-
-        # Save metadata to disk cache
+    def track_clip(self, seconds: float):
+        """
+        Update the running average clip length; it decides CPU vs GPU for small models.
+        """
+        was_short = self._clips_are_short()
+        previous = self.avg_clip_seconds
+        self.avg_clip_seconds = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+        if self._clips_are_short() != was_short:
+            # "auto" now resolves differently; the fast path must not return the old device's model
+            self._last = (None, None, None)
+
+    def warm_up(self, model):
+        """
+        Run a short silent transcription through the model once; later calls are no-ops.
+        """
+        if id(model) in self._warmed:
+            return
         try:
-            with open(self.cache_file, 'wb') as f:
-                metadata = {k: None for k in self.cache}  # Adjust to store metadata only
-                pickle.dump(metadata, f)
-            logger.debug(f"Cache metadata saved to disk at '{self.cache_file}'.")
+            silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+            # VAD would drop the silence before the decoder, so disable it here
+            segments, _ = model.transcribe(
+                silence,
+                beam_size=config.get("beam_size", 1),
+                language=config.get("language"),
+                vad_filter=False
+            )
+            for _ in segments:
+                pass
+            self._warmed.add(id(model))
         except Exception as e:
-            logger.warning(f"Failed to save cache metadata: {e}")
+            logger.warning(f"Model warmup failed: {e}")
+
+    def peek(self, model_name: str, device: str, compute_type: str):
+        """
+        Return the cached model for these settings without loading it, or None.
+        """
+        request = (model_name, device, compute_type)
+        device, compute_type = self.resolve_settings(device, compute_type, model_name)
+        cache_key = (model_name, device, compute_type)
+        with self._model_lock:
+            model = self.cache.get(cache_key)
+            if model is not None:
+                self.stats["hits"] += 1
+                self._touch(cache_key, request, model)
+            return model
+
+    def _evict(self):
+        while len(self.cache) > self.capacity:
+            cache_key, _ = next(iter(self.cache.items()))
+            self._drop(cache_key)
+
+    def _drop(self, cache_key):
+        model = self.cache.pop(cache_key)
+        self._last_used.pop(cache_key, None)
+        self._warmed.discard(id(model))
+        if self._last[2] is model:
+            self._last = (None, None, None)
+        logger.debug("Model %s evicted from memory cache.", cache_key)
+
+    def evict_idle(self, idle_timeout: float, keep=None):
+        """
+        Drop models that haven't been used for idle_timeout seconds, except `keep`.
+        """
+        now = time.monotonic()
+        with self._model_lock:
+            for cache_key, model in list(self.cache.items()):
+                if model is not keep and now - self._last_used.get(cache_key, now) > idle_timeout:
+                    self._drop(cache_key)
+
+    def _touch(self, cache_key, request, model):
+        # Caller holds _model_lock
+        self.cache.move_to_end(cache_key)
+        self._last_used[cache_key] = time.monotonic()
+        self._last = (request, cache_key, model)
+
+    def get_model(self, model_name: str, device: str, compute_type: str):
+        # Fast path: the same arguments as the previous call skip resolving and the key lookup
+        request = (model_name, device, compute_type)
+        last_request, last_key, last_model = self._last
+        if request == last_request:
+            self.stats["hits"] += 1
+            self._last_used[last_key] = time.monotonic()
+            return last_model
+
+        device, compute_type = self.resolve_settings(device, compute_type, model_name)
+        cache_key = (model_name, device, compute_type)
+
+        with self._model_lock:
+            model = self.cache.get(cache_key)
+            if model is not None:
+                logger.debug("Model %s loaded from memory cache.", cache_key)
+                self.stats["hits"] += 1
+                self._touch(cache_key, request, model)
+                return model
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+
+        # Only loads of the same model wait on each other; different models load in parallel
+        with key_lock:
+            with self._model_lock:
+                model = self.cache.get(cache_key)
+                if model is not None:
+                    self.stats["hits"] += 1
+                    self._touch(cache_key, request, model)
+                    return model
+
+            if config.get("use_model_server", False):
+                model = RemoteModel(model_name, device, compute_type, self.cache_dir)
+            else:
+                from faster_whisper import WhisperModel
+                model = WhisperModel(model_name, device=device, compute_type=compute_type)
+
+            with self._model_lock:
+                self.stats["misses"] += 1
+                self.cache[cache_key] = model
+                self._touch(cache_key, request, model)
+                logger.debug("Model %s created and added to cache.", cache_key)
+                self._evict()
 
         return model
 
-class ModelLoader(QThread):
+class ModelLoaderSignals(QObject):
     progress_update = Signal(int)
-    model_ready = Signal(object)
-    
-    def __init__(self, model_name, device, compute_type):
+    # model (None on failure), (model_name, device, compute_type) as requested
+    model_ready = Signal(object, object)
+
+class ModelLoader(QRunnable):
+    def __init__(self, model_name, device, compute_type, warm_up=False):
         super().__init__()
+        self.signals = ModelLoaderSignals()
         self.model_name = model_name
         self.device = device
         self.compute_type = compute_type
+        self.warm_up = warm_up
+
+    @property
+    def request(self):
+        return (self.model_name, self.device, self.compute_type)
 
     def run(self):
         try:
-            self.progress_update.emit(10)
+            self.signals.progress_update.emit(10)
             cache = ModelCache.get_instance()
-            self.progress_update.emit(50)
             model = cache.get_model(self.model_name, self.device, self.compute_type)
-            self.progress_update.emit(100)
-            self.model_ready.emit(model)
+            if self.warm_up:
+                cache.warm_up(model)
+            self.signals.progress_update.emit(100)
+            self.signals.model_ready.emit(model, self.request)
         except Exception as e:
             logger.error(f"Error loading model: {e}")
-            self.model_ready.emit(None)
+            self.signals.model_ready.emit(None, self.request)
+
+class WarmupSignals(QObject):
+    finished = Signal()
+
+class WarmupWorker(QRunnable):
+    """
+    Run one throwaway transcription so the first real one doesn't pay kernel/tokenizer warmup.
+    """
+    def __init__(self, model):
+        super().__init__()
+        self.signals = WarmupSignals()
+        self.model = model
+
+    def run(self):
+        try:
+            ModelCache.get_instance().warm_up(self.model)
+        finally:
+            self.signals.finished.emit()
+
+class CacheInitWorker(QRunnable):
+    """
+    Create the model cache and compile the mixer kernel off the GUI thread.
+    """
+    PRELOAD_PRIORITY = -1
+
+    def run(self):
+        try:
+            cache = ModelCache.get_instance()
+            # Configured preloads first, then models used in earlier sessions; each loads in its
+            # own pool task and one cache slot stays free for the selected model
+            device, compute_type = config.get("device", "auto"), config.get("compute_type", "auto")
+            selected_name = config.get("model_name", "base")
+            seen = {(selected_name, *cache.resolve_settings(device, compute_type, selected_name))}
+            candidates = [
+                (name, *cache.resolve_settings(device, compute_type, name))
+                for name in config.get("preload_models", [])
+            ] + cache.recent()
+            for entry in candidates:
+                if len(seen) >= cache.capacity:
+                    break
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                # Below the default priority: the selected model's loader and the device list go first
+                QThreadPool.globalInstance().start(
+                    ModelLoader(*entry, warm_up=config.get("warmup", True)), self.PRELOAD_PRIORITY
+                )
+            warmup_mixer()
+            logger.debug("Model cache and audio mixer initialized.")
+        except Exception as e:
+            logger.error(f"Error initializing cache: {e}")
 
 class KeybindDialog(QDialog):
     def __init__(self, parent=None):
@@ -188,6 +638,7 @@ class KeybindDialog(QDialog):
             self.listening = True
             self.keybind_button.setText("Press any key...")
             self.status_label.setText("Listening for key press...")
+            import keyboard
             keyboard.hook(self.on_key_press)
     
     def on_key_press(self, event):
@@ -197,6 +648,7 @@ class KeybindDialog(QDialog):
             self.status_label.setText("Key recorded! Click Save to confirm.")
             self.save_button.setEnabled(True)
             self.listening = False
+            import keyboard
             keyboard.unhook(self.on_key_press)
 
     def get_new_keybind(self):
@@ -282,105 +734,195 @@ class RecordingIndicator(QFrame):
         
     opacity_prop = Property(float, get_opacity, set_opacity)
 
-class TranscriptionThread(QThread):
-    transcription_complete = Signal(str)
-    
-    def __init__(self, model, filename, remove_punctuation):
+class TranscriptionSignals(QObject):
+    segment_ready = Signal(str)
+    done = Signal()
+
+class TranscriptionWorker(QRunnable):
+    def __init__(self, model, audio, remove_punctuation, beam_size=1, vad_filter=True, language=None, signals=None, vad_parameters=None):
         super().__init__()
+        self.signals = signals or TranscriptionSignals()
         self.model = model
-        self.filename = filename
-        self.remove_punctuation = remove_punctuation
+        self.audio = audio  # float32 samples at 16 kHz or a path to an audio file
+        # Pick the post-processing once instead of branching per segment
+        self._process = _strip_punctuation if remove_punctuation else (lambda text: text)
+        self.beam_size = beam_size
+        self.vad_filter = vad_filter
+        self.vad_parameters = vad_parameters
+        self.language = language
 
     def run(self):
-        segments, _ = self.model.transcribe(self.filename)
-        for segment in segments:
-            text = segment.text
-            if self.remove_punctuation:
-                text = text.translate(str.maketrans('', '', string.punctuation))
-            self.transcription_complete.emit(text)
+        try:
+            # A fixed language skips the detection pass; VAD keeps silence out of the decoder
+            segments, _ = self.model.transcribe(
+                self.audio,
+                beam_size=self.beam_size,
+                vad_filter=self.vad_filter,
+                vad_parameters=self.vad_parameters,
+                language=self.language,
+                condition_on_previous_text=False,
+                word_timestamps=False
+            )
+            # segments is a generator: each one is emitted as soon as it is decoded,
+            # the GUI coalesces them into one layout pass per flush
+            for segment in segments:
+                self.signals.segment_ready.emit(self._process(segment.text))
+        except Exception as e:
+            logger.error(f"Error during transcription: {e}")
+        finally:
+            self.signals.done.emit()
+
+def _mix_i16(a, b, out):
+    for i in range(a.size):
+        total = np.int32(a[i]) + np.int32(b[i])
+        out[i] = -32768 if total < -32768 else (32767 if total > 32767 else total)
+
+_mix_kernel = None
+
+def _get_mix_kernel():
+    """
+    Return the numba-compiled mixing kernel, or None when numba isn't installed.
+    """
+    global _mix_kernel
+    if _mix_kernel is None:
+        try:
+            from numba import njit
+            _mix_kernel = njit(cache=True, fastmath=True)(_mix_i16)
+        except ImportError:
+            _mix_kernel = False
+    return _mix_kernel or None
+
+def mix_int16(buffers):
+    """
+    Mix raw Int16 PCM buffers of equal length into one, saturating instead of wrapping.
+    """
+    kernel = _get_mix_kernel()
+    if kernel is None:
+        mixed = np.frombuffer(buffers[0], dtype=np.int16).astype(np.int32)
+        for data in buffers[1:]:
+            mixed += np.frombuffer(data, dtype=np.int16)
+        return np.clip(mixed, -32768, 32767).astype(np.int16).tobytes()
+
+    mixed = np.frombuffer(buffers[0], dtype=np.int16).copy()
+    for data in buffers[1:]:
+        kernel(mixed, np.frombuffer(data, dtype=np.int16), mixed)
+    return mixed.tobytes()
+
+def warmup_mixer():
+    """
+    Compile the numba mixing kernel ahead of the first two-source recording.
+    """
+    kernel = _get_mix_kernel()
+    if kernel is not None:
+        sample = np.zeros(1, dtype=np.int16)
+        kernel(sample, sample, sample)
 
 class RecordingThread(QThread):
-    recording_complete = Signal()
+    # audio, rate, channels, transcribe_in_memory: the settings this recording was made with
+    recording_complete = Signal(object, int, int, bool)
     error_occurred = Signal(str)
+    overrun_detected = Signal(int)
+    OVERRUN_REPORT_EVERY = 10
     
-    def __init__(self, audio_format, channels, rate, chunk, filename, input_source, mic_device_index=None, computer_device_index=None):
+    def __init__(self, audio_format, channels, rate, chunk, filename, input_source, mic_device_index=None, computer_device_index=None, save_wav=False, max_seconds=600, transcribe_in_memory=False):
         super().__init__()
         self.audio_format = audio_format
         self.channels = channels
         self.rate = rate
         self.chunk = chunk
         self.filename = filename
+        self.save_wav = save_wav
+        self.transcribe_in_memory = transcribe_in_memory
+        self.max_seconds = max_seconds
         self.input_source = input_source  # "microphone", "computer_audio", "both"
         self.mic_device_index = mic_device_index
         self.computer_device_index = computer_device_index
         self.is_recording = False
-        self.audio = None
         self.streams = []
+        self.queues = []
         self._sample_width = None
+        self.overrun_count = 0
         
+    def _open_stream(self, device_index):
+        stream, frame_queue = AudioEngine.open_input(
+            device_index, self.audio_format, self.channels, self.rate, self.chunk
+        )
+        self.streams.append(stream)
+        self.queues.append(frame_queue)
+
     def run(self):
+        import pyaudio
         try:
-            self.audio = pyaudio.PyAudio()
+            self._sample_width = pyaudio.get_sample_size(self.audio_format)
+            
+            if self.input_source == "both" and self.audio_format != pyaudio.paInt16:
+                raise ValueError("Inspelning från båda källorna kräver formatet Int16.")
             
             # Öppna strömmar baserat på ljudkälla
             if self.input_source in ["microphone", "both"]:
                 if self.mic_device_index is not None:
-                    mic_stream = self.audio.open(
-                        format=self.audio_format,
-                        channels=self.channels,
-                        rate=self.rate,
-                        input=True,
-                        frames_per_buffer=self.chunk,
-                        input_device_index=self.mic_device_index
-                    )
-                    self.streams.append(mic_stream)
+                    self._open_stream(self.mic_device_index)
                 else:
                     raise ValueError("Ingen mikrofonenhet vald.")
             
             if self.input_source in ["computer_audio", "both"]:
                 if self.computer_device_index is not None:
-                    computer_stream = self.audio.open(
-                        format=self.audio_format,
-                        channels=self.channels,
-                        rate=self.rate,
-                        input=True,
-                        frames_per_buffer=self.chunk,
-                        input_device_index=self.computer_device_index
-                    )
-                    self.streams.append(computer_stream)
+                    self._open_stream(self.computer_device_index)
                 else:
                     raise ValueError("Ingen datorljudenhet vald.")
             
-            self._sample_width = self.audio.get_sample_size(self.audio_format)
-            frames = []
+            # Int24 has no numpy dtype; the transcriber reads the WAV file instead then.
+            # np.empty only reserves memory, pages are touched as samples arrive.
+            audio_buffer = None
+            if self.audio_format == pyaudio.paInt16:
+                audio_buffer = np.empty(int(self.rate * self.channels * self.max_seconds), dtype=np.int16)
+            audio_pos = 0
+            chunks_recorded = 0
             self.is_recording = True
             
-            while self.is_recording:
-                for stream in self.streams:
-                    try:
-                        data = stream.read(self.chunk, exception_on_overflow=False)
-                        frames.append(data)
-                    except IOError as e:
-                        logging.error(f"IOError under inspelning: {e}")
-                        continue
+            # WAV-filen skrivs bara när den behövs; annars hålls ljudet i minnet
+            wf = wave.open(self.filename, 'wb') if self.save_wav else None
+            try:
+                if wf:
+                    wf.setnchannels(self.channels)
+                    wf.setsampwidth(self._sample_width)
+                    wf.setframerate(self.rate)
+                
+                # PortAudio fills the queues from its own callback thread; wait until
+                # every stream has delivered a chunk, then mix them into one.
+                pending = [None] * len(self.queues)
+                while self.is_recording:
+                    for i, frame_queue in enumerate(self.queues):
+                        if pending[i] is None:
+                            try:
+                                pending[i], status = frame_queue.get(timeout=0.1)
+                            except queue.Empty:
+                                continue
+                            if status & pyaudio.paInputOverflow:
+                                self._count_overrun()
+                    if all(data is not None for data in pending):
+                        data = pending[0] if len(pending) == 1 else mix_int16(pending)
+                        if audio_buffer is not None:
+                            audio_buffer, audio_pos = self._store_samples(audio_buffer, audio_pos, data)
+                        chunks_recorded += 1
+                        if wf:
+                            # writeframesraw skips the per-call header patch; close() fixes the header
+                            wf.writeframesraw(data)
+                        pending = [None] * len(self.queues)
+            finally:
+                if wf:
+                    wf.close()
             
-            # Stäng strömmar
+            # Pausa strömmar; de återanvänds vid nästa inspelning
             for stream in self.streams:
-                stream.stop_stream()
-                stream.close()
+                AudioEngine.release(stream)
             self.streams = []
+            self.queues = []
             
-            # Spara WAV-fil
-            if frames:
-                try:
-                    with wave.open(self.filename, 'wb') as wf:
-                        wf.setnchannels(self.channels)
-                        wf.setsampwidth(self._sample_width)
-                        wf.setframerate(self.rate)
-                        wf.writeframes(b''.join(frames))
-                    self.recording_complete.emit()
-                except Exception as e:
-                    self.error_occurred.emit(f"Fel vid sparning av inspelning: {str(e)}")
+            if chunks_recorded:
+                # A view of the filled part; no copy
+                audio = audio_buffer[:audio_pos] if audio_buffer is not None else None
+                self.recording_complete.emit(audio, self.rate, self.channels, self.transcribe_in_memory)
             
         except Exception as e:
             self.error_occurred.emit(f"Inspelningsfel: {str(e)}")
@@ -388,16 +930,31 @@ class RecordingThread(QThread):
         finally:
             self.cleanup_resources()
 
+    @staticmethod
+    def _store_samples(audio_buffer, audio_pos, data):
+        samples = np.frombuffer(data, dtype=np.int16)
+        end = audio_pos + samples.size
+        if end > audio_buffer.size:
+            # Longer than max_seconds: grow rather than drop audio
+            grown = np.empty(max(end, 2 * audio_buffer.size), dtype=np.int16)
+            grown[:audio_pos] = audio_buffer[:audio_pos]
+            audio_buffer = grown
+        audio_buffer[audio_pos:end] = samples
+        return audio_buffer, end
+
+    def _count_overrun(self):
+        # PortAudio dropped input samples because the buffer wasn't drained in time
+        self.overrun_count += 1
+        if self.overrun_count == 1 or self.overrun_count % self.OVERRUN_REPORT_EVERY == 0:
+            logger.warning(f"Input overflow during recording ({self.overrun_count} so far).")
+            self.overrun_detected.emit(self.overrun_count)
+
     def cleanup_resources(self):
         try:
             for stream in self.streams:
-                if stream.is_active():
-                    stream.stop_stream()
-                stream.close()
+                AudioEngine.release(stream)
             self.streams = []
-            if self.audio:
-                self.audio.terminate()
-                self.audio = None
+            self.queues = []
             self.is_recording = False
         except Exception as e:
             logging.error(f"Fel vid städning av ljudresurser: {e}")
@@ -407,18 +964,48 @@ class RecordingThread(QThread):
         self.wait()
 
 class WhisperTranscription(QWidget):
+    OVERRUN_CHUNK_THRESHOLD = 20
+    MAX_CHUNK = 8192
+    CONFIG_SAVE_DELAY_MS = 500
+    OUTPUT_FLUSH_MS = 50
+    IDLE_CHECK_MS = 60000
+    # Ljudkälla -> (mikrofon aktiv, datorljud aktiv)
+    _SRC_MASK = {
+        "microphone": (True, False),
+        "computer_audio": (False, True),
+        "both": (True, True),
+    }
+
     def __init__(self):
         super().__init__()
         self.model = None
+        self._pending_request = None
         self.defining_all_config_variables_from_config()
 
-        # Hämta lista över inmatningsenheter innan setup_ui
-        self.input_devices = list_input_devices()  
+        # Config writes are coalesced and flushed shortly after the last change
+        self._config_dirty = False
+        self._config_timer = QTimer(self)
+        self._config_timer.setSingleShot(True)
+        self._config_timer.setInterval(self.CONFIG_SAVE_DELAY_MS)
+        self._config_timer.timeout.connect(self._flush_config)
+
+        # Visa cachade enheter direkt; den riktiga listan hämtas i bakgrunden
+        self.input_devices = [tuple(device) for device in config.get("device_cache", [])]
+
+        # Models nobody has used for a while are dropped to free their weights
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setInterval(self.IDLE_CHECK_MS)
+        self._idle_timer.timeout.connect(self.evict_idle_models)
+        self._idle_timer.start()
+
+        # One pool and one signal emitter shared by every transcription, wired up once
+        self._pool = QThreadPool.globalInstance()
+        self._transcription_signals = TranscriptionSignals()
 
         self.setup_ui()
+        self.refresh_input_devices()
         self.update_record_button_text()
         self.recording_thread = None
-        self.transcription_thread = None
         self.is_recording = False
         self.hotkey_pressed = False
         
@@ -433,8 +1020,7 @@ class WhisperTranscription(QWidget):
         Retrieve and define all config variables from the config dictionary.
         """
         # Audio settings
-        self.audio_format = (pyaudio.paInt16 if config.get("audio_format", "Int16") == "Int16" 
-                           else pyaudio.paInt24)
+        self.audio_format_name = config.get("audio_format", "Int16")
         self.channels = config.get("channels", 1)
         self.rate = config.get("rate", 16000)
         self.chunk = config.get("chunk", 1024)
@@ -443,6 +1029,11 @@ class WhisperTranscription(QWidget):
         # Remove punctuation setting
         self.remove_punctuation = config.get("remove_punctuation", False)
 
+    @property
+    def audio_format(self):
+        import pyaudio
+        return pyaudio.paInt16 if self.audio_format_name == "Int16" else pyaudio.paInt24
+
     def setup_model_loader(self):
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
@@ -451,37 +1042,84 @@ class WhisperTranscription(QWidget):
             layout.insertWidget(0, self.progress_bar)
         else:
             logger.warning("No layout found to insert the progress bar.")
-        
-        self.loader = ModelLoader(
-            config.get("model_name", "base"),
-            config.get("device", "cpu"),
-            config.get("compute_type", "float32")
-        )
-        self.loader.progress_update.connect(self.update_progress)
-        self.loader.model_ready.connect(self.handle_model_loaded)
-        self.loader.start()
+        self.start_model_loader()
+
+    def start_model_loader(self):
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.loader = ModelLoader(*self.selected_model())
+        self._pending_request = self.loader.request
+        self.loader.signals.progress_update.connect(self.update_progress)
+        self.loader.signals.model_ready.connect(self.handle_model_loaded)
+        self._pool.start(self.loader)
 
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
-    def handle_model_loaded(self, model):
+    def selected_model(self):
+        return (
+            config.get("model_name", "base"),
+            config.get("device", "auto"),
+            config.get("compute_type", "auto")
+        )
+
+    def _finish_loading(self, status):
+        self.progress_bar.hide()
+        if not self.is_recording:
+            self.status_label.setText(status)
+
+    def handle_model_loaded(self, model, request):
+        # A slower load for an earlier selection may finish last; it must not replace the current one
+        if request != self._pending_request or request != self.selected_model():
+            if self._pending_request is None:
+                self._finish_loading("Ready")
+            logger.debug("Discarding superseded model load %s.", request)
+            return
+        self._pending_request = None
         if model:
             self.model = model
+            self.mark_model_active()
             self.record_btn.setEnabled(True)
-            self.status_label.setText("Ready")
+            if config.get("warmup", True):
+                self._finish_loading("Warming up...")
+                self.warmup_worker = WarmupWorker(model)
+                self.warmup_worker.signals.finished.connect(self.handle_warmup_finished)
+                self._pool.start(self.warmup_worker)
+            else:
+                self._finish_loading("Ready")
             logger.debug("Model loaded and ready.")
         else:
-            self.status_label.setText("Error loading model")
+            self._finish_loading("Error loading model")
             logger.error("Failed to load model.")
-        
-        self.progress_bar.hide()
+
+    def handle_warmup_finished(self):
+        # Don't overwrite the status if a recording started meanwhile
+        if self.status_label.text() == "Warming up...":
+            self.status_label.setText("Ready")
+        logger.debug("Model warmup finished.")
+
+    def evict_idle_models(self):
+        cache = ModelCache.get_instance()
+        cache.evict_idle(config.get("model_idle_timeout", 1800), keep=self.model)
+        logger.debug("Model cache: %s loaded, %s hits, %s misses.", len(cache.cache), cache.stats['hits'], cache.stats['misses'])
+
+    def mark_model_active(self):
+        cache = ModelCache.get_instance()
+        if cache.mark_active(*self.selected_model()):
+            self._pool.start(cache.save_active)
 
     def init_model(self):
-        self.model = WhisperModel(
-            config.get("model_name", "base"),
-            device=config.get("device", "cpu"),
-            compute_type=config.get("compute_type", "float32")
-        )
+        # Cached models switch instantly; anything else loads on the pool without blocking the GUI
+        model = ModelCache.get_instance().peek(*self.selected_model())
+        if model is not None:
+            self.model = model
+            self.mark_model_active()
+            # Any load still running for an earlier selection is now superseded
+            self._pending_request = None
+            self._finish_loading("Ready")
+            return
+        self.update_status("Loading model...", False)
+        self.start_model_loader()
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -509,6 +1147,15 @@ class WhisperTranscription(QWidget):
         self.model_combo.setCurrentText(config.get("model_name", "base"))
         model_layout.addWidget(QLabel("Model:"))
         model_layout.addWidget(self.model_combo)
+        self.compute_type_combo = QComboBox()
+        self.compute_type_combo.addItems(["auto", "float16", "int8_float16", "int8", "float32"])
+        self.compute_type_combo.setCurrentText(config.get("compute_type", "auto"))
+        model_layout.addWidget(QLabel("Compute:"))
+        model_layout.addWidget(self.compute_type_combo)
+        self.vad_checkbox = QCheckBox("VAD")
+        self.vad_checkbox.setToolTip("Hoppa över tystnad innan avkodning")
+        self.vad_checkbox.setChecked(config.get("vad", {}).get("enabled", True))
+        model_layout.addWidget(self.vad_checkbox)
         layout.addLayout(model_layout)
         
         # Audio settings
@@ -547,18 +1194,6 @@ class WhisperTranscription(QWidget):
         device_layout.addWidget(QLabel("Välj enhet:"))
         
         self.device_combo = QComboBox()
-        self.device_combo.addItem("Välj en enhet")
-        for idx, name in self.input_devices:
-            self.device_combo.addItem(name, userData=idx)
-        
-        # Sätt valt enhetsindex om det finns i config
-        selected_device_index = config.get("input_device_index")
-        if selected_device_index is not None:
-            for i in range(self.device_combo.count()):
-                if self.device_combo.itemData(i) == selected_device_index:
-                    self.device_combo.setCurrentIndex(i)
-                    break
-        
         self.device_combo.currentIndexChanged.connect(self.update_input_device)
         device_layout.addWidget(self.device_combo)
         
@@ -569,18 +1204,7 @@ class WhisperTranscription(QWidget):
         computer_device_layout.addWidget(QLabel("Datorljudenhet:"))
         
         self.computer_device_combo = QComboBox()
-        self.computer_device_combo.addItem("Välj en enhet")
-        for idx, name in self.input_devices:
-            if "cable" in name.lower() or "virtual" in name.lower():
-                self.computer_device_combo.addItem(name, userData=idx)
-        
-        # Sätt valt datorenhetsindex om det finns i config
-        selected_computer_device_index = config.get("computer_device_index")
-        if selected_computer_device_index is not None:
-            for i in range(self.computer_device_combo.count()):
-                if self.computer_device_combo.itemData(i) == selected_computer_device_index:
-                    self.computer_device_combo.setCurrentIndex(i)
-                    break
+        self.populate_device_combos(self.input_devices)
         
         self.computer_device_combo.currentIndexChanged.connect(self.update_computer_device)
         computer_device_layout.addWidget(self.computer_device_combo)
@@ -602,13 +1226,57 @@ class WhisperTranscription(QWidget):
         # Output
         self.output_text = QTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setUndoRedoEnabled(False)
         layout.addWidget(self.output_text)
         
+        # Incoming text is inserted at the end through one cursor, in batches
+        self._out_cursor = self.output_text.textCursor()
+        self._pending_output = []
+        self._output_timer = QTimer(self)
+        self._output_timer.setSingleShot(True)
+        self._output_timer.setInterval(self.OUTPUT_FLUSH_MS)
+        self._output_timer.timeout.connect(self._flush_output)
+        
         self.setLayout(layout)
         
         # Initial aktivering/deaktivera dropdowns baserat på ljudkälla
         self.update_input_source(self.input_source_combo.currentText())
 
+    def populate_device_combos(self, devices):
+        self.input_devices = devices
+        for combo in (self.device_combo, self.computer_device_combo):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem("Välj en enhet")
+        
+        # Enhetsindex per dropdown-position; position 0 är "Välj en enhet"
+        computer_devices = [(idx, name) for idx, name in devices
+                            if "cable" in name.lower() or "virtual" in name.lower()]
+        self._input_device_indices = [None] + [idx for idx, _ in devices]
+        self._computer_device_indices = [None] + [idx for idx, _ in computer_devices]
+        self.device_combo.addItems([name for _, name in devices])
+        self.computer_device_combo.addItems([name for _, name in computer_devices])
+        
+        # Sätt valda enhetsindex om de finns i config
+        for combo, indices, key in ((self.device_combo, self._input_device_indices, "input_device_index"),
+                                    (self.computer_device_combo, self._computer_device_indices, "computer_device_index")):
+            selected_index = config.get(key)
+            if selected_index is not None and selected_index in indices:
+                combo.setCurrentIndex(indices.index(selected_index))
+            combo.blockSignals(False)
+
+    def refresh_input_devices(self):
+        worker = DeviceListWorker()
+        worker.signals.devices_listed.connect(self.handle_devices_listed)
+        self._pool.start(worker)
+
+    def handle_devices_listed(self, devices):
+        if devices != self.input_devices:
+            self.populate_device_combos(devices)
+            config["device_cache"] = [list(device) for device in devices]
+            self._mark_config_dirty()
+            logger.debug("Enhetslista uppdaterad: %s enheter.", len(devices))
+
     def update_record_button_text(self):
         # Update the record button's text with the current keybind
         self.record_btn.setText(f"Record ({config.get('speak_hotkey', 'None')})")
@@ -617,30 +1285,47 @@ class WhisperTranscription(QWidget):
         self.record_btn.clicked.connect(self.toggle_recording)
         self.stop_btn.clicked.connect(self.stop_recording)
         self.clear_btn.clicked.connect(self.output_text.clear)
+        self._transcription_signals.segment_ready.connect(self.append_segment)
+        self._transcription_signals.done.connect(self.handle_transcription_done)
         self.model_combo.currentTextChanged.connect(self.update_model)
+        self.compute_type_combo.currentTextChanged.connect(self.update_compute_type)
+        self.vad_checkbox.toggled.connect(self.update_vad)
         self.format_combo.currentTextChanged.connect(self.update_audio_format)
         self.channels_input.editingFinished.connect(self.update_channels)
         self.rate_input.editingFinished.connect(self.update_rate)
         self.chunk_input.editingFinished.connect(self.update_chunk)
         
         # Setup keyboard hooks based on config
-        keyboard.on_press_key(config.get("speak_hotkey", "None"), self.handle_hotkey_press, suppress=True)
-        keyboard.on_release_key(config.get("speak_hotkey", "None"), self.handle_hotkey_release, suppress=True)
+        self.register_keyboard_hooks()
+
+    def register_keyboard_hooks(self):
+        import keyboard
+        hotkey = config.get("speak_hotkey", "None")
+        # One hook for both directions: keyboard keys its removers by key name, so separate
+        # press and release hooks on the same key can't both be unhooked
+        self._hotkey_hook = keyboard.hook_key(hotkey, self.handle_hotkey_event, suppress=True)
+
+    def handle_hotkey_event(self, event):
+        import keyboard
+        if event.event_type == keyboard.KEY_DOWN:
+            self.handle_hotkey_press(event)
+        else:
+            self.handle_hotkey_release(event)
 
     def update_audio_format(self):
         new_format = self.format_combo.currentText()
         config["audio_format"] = new_format
-        save_config(config)
-        self.audio_format = pyaudio.paInt16 if new_format == "Int16" else pyaudio.paInt24
-        logger.debug(f"Audio format uppdaterad till {new_format}.")
+        self._mark_config_dirty()
+        self.audio_format_name = new_format
+        logger.debug("Audio format uppdaterad till %s.", new_format)
 
     def update_channels(self):
         try:
             new_channels = int(self.channels_input.text())
             config["channels"] = new_channels
-            save_config(config)
+            self._mark_config_dirty()
             self.channels = new_channels
-            logger.debug(f"Channels uppdaterade till {new_channels}.")
+            logger.debug("Channels uppdaterade till %s.", new_channels)
         except ValueError:
             logger.error("Invalid channels input. Reverting to previous value.")
             self.channels_input.setText(str(config.get("channels", 1)))
@@ -649,9 +1334,9 @@ class WhisperTranscription(QWidget):
         try:
             new_rate = int(self.rate_input.text())
             config["rate"] = new_rate
-            save_config(config)
+            self._mark_config_dirty()
             self.rate = new_rate
-            logger.debug(f"Rate uppdaterade till {new_rate}.")
+            logger.debug("Rate uppdaterade till %s.", new_rate)
         except ValueError:
             logger.error("Invalid rate input. Reverting to previous value.")
             self.rate_input.setText(str(config.get("rate", 16000)))
@@ -660,9 +1345,9 @@ class WhisperTranscription(QWidget):
         try:
             new_chunk = int(self.chunk_input.text())
             config["chunk"] = new_chunk
-            save_config(config)
+            self._mark_config_dirty()
             self.chunk = new_chunk
-            logger.debug(f"Chunk size uppdaterades till {new_chunk}.")
+            logger.debug("Chunk size uppdaterades till %s.", new_chunk)
         except ValueError:
             logger.error("Invalid chunk input. Reverting to previous value.")
             self.chunk_input.setText(str(config.get("chunk", 1024)))
@@ -672,11 +1357,11 @@ class WhisperTranscription(QWidget):
         dialog.exec()
 
     def update_keyboard_hooks(self):
-        # Remove old hooks
-        keyboard.unhook_all()
+        import keyboard
+        # Remove only our own hooks
+        keyboard.unhook(self._hotkey_hook)
         # Add new hooks based on updated config
-        keyboard.on_press_key(config.get("speak_hotkey", "None"), self.handle_hotkey_press, suppress=True)
-        keyboard.on_release_key(config.get("speak_hotkey", "None"), self.handle_hotkey_release, suppress=True)
+        self.register_keyboard_hooks()
         # Update record button's text
         self.update_record_button_text()
         logger.debug("Keyboard hooks uppdaterade.")
@@ -713,6 +1398,7 @@ class WhisperTranscription(QWidget):
             mic_device_index = config.get("input_device_index")
             computer_device_index = config.get("computer_device_index")
             
+            in_memory = self.can_transcribe_in_memory()
             self.recording_thread = RecordingThread(
                 self.audio_format,
                 self.channels,
@@ -721,10 +1407,14 @@ class WhisperTranscription(QWidget):
                 self.filename,
                 input_source,
                 mic_device_index=mic_device_index,
-                computer_device_index=computer_device_index
+                computer_device_index=computer_device_index,
+                save_wav=config.get("save_wav", False) or not in_memory,
+                max_seconds=config.get("max_record_seconds", 600),
+                transcribe_in_memory=in_memory
             )
             self.recording_thread.recording_complete.connect(self.handle_recording_complete)
             self.recording_thread.error_occurred.connect(self.handle_recording_error)
+            self.recording_thread.overrun_detected.connect(self.handle_overrun)
             self.recording_thread.start()
             logger.debug("Inspelning startad.")
             
@@ -751,6 +1441,17 @@ class WhisperTranscription(QWidget):
             logger.error(f"Fel vid stopp av inspelning: {e}")
             self.handle_recording_error(str(e))
 
+    def handle_overrun(self, count):
+        if self.is_recording:
+            self.update_status(f"Recording... ({count} overruns)", True)
+        # Persistent overruns mean the buffer is too small; use a larger chunk from the next recording
+        if count == self.OVERRUN_CHUNK_THRESHOLD and self.chunk < self.MAX_CHUNK:
+            self.chunk = min(self.chunk * 2, self.MAX_CHUNK)
+            self.chunk_input.setText(str(self.chunk))
+            config["chunk"] = self.chunk
+            self._mark_config_dirty()
+            logger.warning(f"Chunk size increased to {self.chunk} after {count} overruns.")
+
     def handle_recording_error(self, error_message):
         logger.error(f"Inspelningsfel: {error_message}")
         self.update_status(f"Error: {error_message}", False)
@@ -760,38 +1461,93 @@ class WhisperTranscription(QWidget):
         self.is_recording = False
         self.hotkey_pressed = False
 
+    def _mark_config_dirty(self):
+        self._config_dirty = True
+        self._config_timer.start()
+
+    def _flush_config(self):
+        self._config_timer.stop()
+        if self._config_dirty:
+            self._config_dirty = False
+            try:
+                save_config(config)
+            except OSError as e:
+                logger.error(f"Failed to save config: {e}")
+
     def cleanup(self):
+        self._flush_config()
         if self.recording_thread:
             self.recording_thread.cleanup_resources()
             self.recording_thread.wait()
-        if self.transcription_thread:
-            self.transcription_thread.wait()
-        logger.debug("Cleaned up recording and transcription threads.")
+        logger.debug("Cleaned up recording thread.")
 
     def closeEvent(self, event):
         self.cleanup()
         super().closeEvent(event)
 
-    def handle_recording_complete(self):
+    def can_transcribe_in_memory(self):
+        # Whisper expects 16 kHz samples; other rates need the decoder's resampling via the WAV file
+        return self.audio_format_name == "Int16" and self.rate == WHISPER_SAMPLE_RATE
+
+    def handle_recording_complete(self, audio, rate, channels, in_memory):
+        # Use the settings the recording was made with; the inputs may have changed since
         self.update_status("Transcribing...", False)
-        self.transcription_thread = TranscriptionThread(
-            self.model, self.filename, self.remove_punctuation
+        if audio is not None:
+            ModelCache.get_instance().track_clip(audio.size / (rate * channels))
+        if audio is not None and in_memory:
+            audio = audio.astype(np.float32) / 32768.0
+            if channels > 1:
+                audio = audio.reshape(-1, channels).mean(axis=1)
+        else:
+            audio = self.filename
+        vad = config.get("vad", {})
+        worker = TranscriptionWorker(
+            self.model, audio, self.remove_punctuation,
+            beam_size=config.get("beam_size", 1),
+            vad_filter=vad.get("enabled", True),
+            vad_parameters={key: value for key, value in vad.items() if key != "enabled"} or None,
+            language=config.get("language"),
+            signals=self._transcription_signals
         )
-        self.transcription_thread.transcription_complete.connect(self.handle_transcription)
-        self.transcription_thread.start()
+        self._pool.start(worker)
         logger.debug("Recording complete. Started transcription.")
 
-    def handle_transcription(self, text):
-        self.output_text.append(text)
+    def _flush_output(self):
+        if self._pending_output:
+            self._out_cursor.movePosition(QTextCursor.End)
+            self._out_cursor.insertText("\n".join(self._pending_output) + "\n")
+            self._pending_output = []
+            scroll_bar = self.output_text.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def append_segment(self, text):
+        self._pending_output.append(text)
+        if not self._output_timer.isActive():
+            self._output_timer.start()
+
+    def handle_transcription_done(self):
         self.update_status("Ready", False)
         self.record_btn.setEnabled(True)
         logger.debug("Transcription complete.")
 
     def update_model(self, model_name):
         config["model_name"] = model_name
-        save_config(config)
+        self._mark_config_dirty()
+        self.init_model()
+        logger.debug("Model uppdaterad till '%s'.", model_name)
+
+    def update_vad(self, enabled):
+        config.setdefault("vad", {})["enabled"] = enabled
+        self._mark_config_dirty()
+        logger.debug("VAD %s.", 'aktiverad' if enabled else 'avaktiverad')
+
+    def update_compute_type(self, compute_type):
+        # Models are cached per compute_type, so this loads (or reuses) the matching variant
+        config["compute_type"] = compute_type
+        self._mark_config_dirty()
+        # Load errors (e.g. float16 on a CPU-only machine) surface via handle_model_loaded
         self.init_model()
-        logger.debug(f"Model uppdaterad till '{model_name}'.")
+        logger.debug("Compute type uppdaterad till '%s'.", compute_type)
 
     def handle_hotkey_press(self, event):
         if not self.hotkey_pressed:
@@ -806,34 +1562,30 @@ class WhisperTranscription(QWidget):
     # Nya metoder för att hantera ljudkällor och enheter
     def update_input_source(self, selected_source):
         config["input_source"] = selected_source
-        save_config(config)
+        self._mark_config_dirty()
         
         # Aktivera/deaktivera enhetsdropdowns baserat på val
-        if selected_source == "microphone":
-            self.device_combo.setEnabled(True)
-            self.computer_device_combo.setEnabled(False)
-        elif selected_source == "computer_audio":
-            self.device_combo.setEnabled(False)
-            self.computer_device_combo.setEnabled(True)
-        elif selected_source == "both":
-            self.device_combo.setEnabled(True)
-            self.computer_device_combo.setEnabled(True)
-        
-        logger.debug(f"Ljudkälla uppdaterad till '{selected_source}'.")
+        mic_enabled, computer_enabled = self._SRC_MASK.get(selected_source, (False, False))
+        for combo, enabled in ((self.device_combo, mic_enabled), (self.computer_device_combo, computer_enabled)):
+            blocked = combo.blockSignals(True)
+            combo.setEnabled(enabled)
+            combo.blockSignals(blocked)
+        
+        logger.debug("Ljudkälla uppdaterad till '%s'.", selected_source)
 
     def update_input_device(self, index):
-        device_index = self.device_combo.itemData(index)
+        device_index = self._input_device_indices[index] if index >= 0 else None
         if device_index is not None:
             config["input_device_index"] = device_index
-            save_config(config)
-            logger.debug(f"Mikrofonenhet uppdaterad till index {device_index}.")
+            self._mark_config_dirty()
+            logger.debug("Mikrofonenhet uppdaterad till index %s.", device_index)
 
     def update_computer_device(self, index):
-        computer_device_index = self.computer_device_combo.itemData(index)
+        computer_device_index = self._computer_device_indices[index] if index >= 0 else None
         if computer_device_index is not None:
             config["computer_device_index"] = computer_device_index
-            save_config(config)
-            logger.debug(f"Datorljudenhet uppdaterad till index {computer_device_index}.")
+            self._mark_config_dirty()
+            logger.debug("Datorljudenhet uppdaterad till index %s.", computer_device_index)
 
 class WhisperHub(QMainWindow):
     def __init__(self, config=None):
@@ -843,8 +1595,9 @@ class WhisperHub(QMainWindow):
         # Initialize all config variables
         self.defining_all_config_variables_from_config()
         
-        # Pre-initialize cache in background
-        threading.Thread(target=self.init_cache, daemon=True).start()
+        # Pre-initialize cache in background; the record button is enabled once the model itself is loaded
+        self.cache_worker = CacheInitWorker()
+        QThreadPool.globalInstance().start(self.cache_worker)
         
         self.init_ui()
         ThemeManager.apply_widget_theme(self)
@@ -858,7 +1611,7 @@ class WhisperHub(QMainWindow):
         try:
             width, height = map(int, default_size.lower().split("x"))
             self.setFixedSize(width, height)
-            logger.debug(f"Window size set to {width}x{height}.")
+            logger.debug("Window size set to %sx%s.", width, height)
         except ValueError:
             logger.error(f"Invalid default_window_size format: '{default_size}'. Expected format 'WIDTHxHEIGHT'.")
         
@@ -866,9 +1619,6 @@ class WhisperHub(QMainWindow):
         self.setWindowTitle("Whisper Hub")
         logger.debug("Window title set to 'Whisper Hub'.")
 
-    def init_cache(self):
-        ModelCache.get_instance()
-
     def init_ui(self):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
@@ -877,23 +1627,30 @@ class WhisperHub(QMainWindow):
         self.tabs.addTab(self.whisper_tab, "Whisper")
         logger.debug("Whisper tab added to the application.")
 
+    def closeEvent(self, event):
+        # Tab widgets don't receive closeEvent themselves; flush pending config and threads here
+        self.whisper_tab.cleanup()
+        super().closeEvent(event)
+
 def main():
     try:
         app = QApplication(sys.argv)
         
-        # Load themes based on config
+        # Themes are loaded lazily from this path on first use
         themes_file_path = config.get("themes_file_path", "themes/custom_themes.json")
-        ThemeManager.load_themes(os.path.join(os.path.dirname(__file__), themes_file_path))
+        ThemeManager.custom_themes_path = os.path.join(os.path.dirname(__file__), themes_file_path)
         
         # Apply theme
         default_theme = config.get("default_theme", "dark")
         ThemeManager.apply_theme(app, config.get('theme', default_theme))
-        logger.debug(f"Theme '{config.get('theme', default_theme)}' applied.")
+        logger.debug("Theme '%s' applied.", config.get('theme', default_theme))
 
         window = WhisperHub()
         window.show()
         
-        return app.exec()
+        exit_code = app.exec()
+        AudioEngine.terminate()
+        return exit_code
     
     except Exception as e:
         logger.error(f"Fatal error during startup: {str(e)}")
@@ -0,0 +1,100 @@
+# ./fast_whisper_v2/model_server.py
+
+import logging
+import os
+import secrets
+import sys
+import time
+from multiprocessing.connection import Listener, AuthenticationError
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+def load_authkey(key_file):
+    """
+    Read the shared secret for the model server, creating it on first use.
+    """
+    key_file = Path(key_file)
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # O_EXCL: the file is private from the start and only one of GUI/server creates it
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secrets.token_bytes(32))
+    # The other process may have created the file but not written the key yet
+    for _ in range(100):
+        authkey = key_file.read_bytes()
+        if authkey:
+            return authkey
+        time.sleep(0.01)
+    raise RuntimeError(f"Model server key file '{key_file}' is empty.")
+
+class ModelServer:
+    """
+    Keeps Whisper models loaded in a long-lived process so GUI restarts don't reload weights.
+    """
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.models = {}
+        self.running = False
+
+    def get_model(self, model_name, device, compute_type):
+        key = (model_name, device, compute_type)
+        if key not in self.models:
+            from faster_whisper import WhisperModel
+            logger.info(f"Loading model {key}.")
+            self.models[key] = WhisperModel(model_name, device=device, compute_type=compute_type)
+        return self.models[key]
+
+    def handle(self, request):
+        command = request[0]
+        if command == "ping":
+            return "pong"
+        if command == "load":
+            self.get_model(*request[1:4])
+            return True
+        if command == "transcribe":
+            _, model_key, audio, options = request
+            segments, _ = self.get_model(*model_key).transcribe(audio, **options)
+            return [segment.text for segment in segments]
+        if command == "shutdown":
+            self.running = False
+            return True
+        raise ValueError(f"Unknown command: {command}")
+
+    def serve_forever(self):
+        self.running = True
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Model server listening on {self.address}.")
+            while self.running:
+                try:
+                    conn = listener.accept()
+                except (OSError, AuthenticationError) as e:
+                    logger.warning(f"Rejected connection: {e}")
+                    continue
+                with conn:
+                    try:
+                        request = conn.recv()
+                    except EOFError:
+                        continue
+                    try:
+                        conn.send(("ok", self.handle(request)))
+                    except Exception as e:
+                        logger.error(f"Request {request[0]!r} failed: {e}")
+                        conn.send(("error", str(e)))
+
+def main():
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} PORT KEY_FILE")
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    port, key_file = int(sys.argv[1]), sys.argv[2]
+    ModelServer(("localhost", port), load_authkey(key_file)).serve_forever()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
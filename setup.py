@@ -10,8 +10,35 @@ from setuptools.command.install import install
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
 
+def detect_cpu_flags():
+    """Return the CPU feature flags, or an empty set if they can't be determined."""
+    try:
+        import cpuinfo
+        return set(cpuinfo.get_cpu_info().get("flags", []))
+    except ImportError:
+        pass
+    if platform.system() == "Linux":
+        try:
+            with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("flags"):
+                        return set(line.split(":", 1)[1].split())
+        except OSError:
+            pass
+    return set()
+
 class CustomInstallCommand(install):
     def run(self):
+        # CTranslate2 wheels ship MKL/oneDNN and pick the best kernels at runtime;
+        # this only tells the user which int8 path their CPU will get
+        flags = detect_cpu_flags()
+        if "avx512_vnni" in flags or "avx512vnni" in flags:
+            print("CPU supports AVX-512 VNNI: int8 inference uses the VNNI kernels.")
+        elif "avx2" in flags:
+            print("CPU supports AVX2: int8 inference uses the AVX2 kernels.")
+        elif platform.machine().lower() in ("arm64", "aarch64"):
+            print("ARM CPU detected: int8 inference uses the NEON kernels.")
+
         # Create virtual environment if it doesn't exist
         venv_dir = "env"
         if not os.path.exists(venv_dir):
@@ -35,8 +62,9 @@ class CustomInstallCommand(install):
                 "pyaudio",
                 "PySide6",
                 "keyboard",
+                "numpy",
                 "faster-whisper",
-                "ctranslate2"
+                "ctranslate2>=4.4"
             ]
             
             for req in requirements:
@@ -78,8 +106,9 @@ setup(
         "pyaudio",
         "PySide6",
         "keyboard",
+        "numpy",
         "faster-whisper",
-        "ctranslate2",
+        "ctranslate2>=4.4",
     ],
     entry_points={
         "console_scripts": [
@@ -90,6 +119,10 @@ setup(
         "dev": [
             "pytest",
             "flake8",
+        ],
+        "speedups": [
+            "numba",
+            "orjson",
         ]
     },
     package_data={
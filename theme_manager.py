@@ -7,6 +7,11 @@ import os
 from typing import Optional
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class ThemeManager:
@@ -35,21 +40,43 @@ class ThemeManager:
         }
     }
 
+    custom_themes_path = None
     _current_theme = "dark"
     _themes = {}
     _initialized = False
+    _themes_signature = None
+    _stylesheet_cache = {}
+    _palette_cache = {}
 
     @classmethod
     def load_themes(cls, custom_themes_path: Optional[str] = None):
         """
         Load themes from a JSON file and combine with default themes.
+        Defaults to custom_themes_path; called lazily on first theme access.
         """
+        custom_themes_path = custom_themes_path or cls.custom_themes_path
+        signature = None
+        if custom_themes_path:
+            try:
+                st = os.stat(custom_themes_path)
+                signature = (custom_themes_path, st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+        
+        # Unchanged file: keep the parsed themes and the cached stylesheets/palettes
+        if cls._initialized and signature == cls._themes_signature:
+            return
+        
         cls._themes = cls.DEFAULT_THEMES.copy()
+        cls._stylesheet_cache.clear()
+        cls._palette_cache.clear()
+        cls._themes_signature = signature
         
-        if custom_themes_path and os.path.exists(custom_themes_path):
+        if signature:
             try:
-                with open(custom_themes_path, 'r') as f:
-                    custom_themes = json.load(f)
+                with open(custom_themes_path, 'rb') as f:
+                    data = f.read()
+                custom_themes = orjson.loads(data) if orjson else json.loads(data)
                 cls._themes.update(custom_themes)
                 logger.info(f"Loaded custom themes from {custom_themes_path}")
             except Exception as e:
@@ -77,22 +104,12 @@ class ThemeManager:
             cls.load_themes()
             
         theme_name = theme_name or cls._current_theme
-        colors = cls.get_theme_colors(theme_name)
         cls._current_theme = theme_name
 
-        # Create and configure palette
-        palette = QPalette()
-        palette.setColor(QPalette.Window, QColor(colors["primary"]))
-        palette.setColor(QPalette.WindowText, QColor(colors["primary_text"]))
-        palette.setColor(QPalette.Base, QColor(colors["secondary_bg"]))
-        palette.setColor(QPalette.AlternateBase, QColor(colors["tertiary"]))
-        palette.setColor(QPalette.Text, QColor(colors["primary_text"]))
-        palette.setColor(QPalette.Button, QColor(colors["primary_btn"]))
-        palette.setColor(QPalette.ButtonText, QColor(colors["primary_text"]))
-        app.setPalette(palette)
+        app.setPalette(cls._build_palette(theme_name))
 
         # Apply global stylesheet
-        app.setStyleSheet(cls._generate_stylesheet(colors))
+        app.setStyleSheet(cls._get_stylesheet(theme_name))
 
     @classmethod
     def apply_widget_theme(cls, widget, theme_name: str = None):
@@ -103,21 +120,43 @@ class ThemeManager:
             cls.load_themes()
             
         theme_name = theme_name or cls._current_theme
-        colors = cls.get_theme_colors(theme_name)
         
         # Apply palette to widget
-        palette = widget.palette()
-        palette.setColor(QPalette.Window, QColor(colors["primary"]))
-        palette.setColor(QPalette.WindowText, QColor(colors["primary_text"]))
-        palette.setColor(QPalette.Base, QColor(colors["secondary_bg"]))
-        palette.setColor(QPalette.AlternateBase, QColor(colors["tertiary"]))
-        palette.setColor(QPalette.Text, QColor(colors["primary_text"]))
-        palette.setColor(QPalette.Button, QColor(colors["primary_btn"]))
-        palette.setColor(QPalette.ButtonText, QColor(colors["primary_text"]))
-        widget.setPalette(palette)
+        widget.setPalette(cls._build_palette(theme_name))
         
         # Apply stylesheet to widget
-        widget.setStyleSheet(cls._generate_stylesheet(colors))
+        widget.setStyleSheet(cls._get_stylesheet(theme_name))
+
+    @classmethod
+    def _build_palette(cls, theme_name: str):
+        """
+        Return the palette for a theme, building it only once per theme.
+        Callers get an (implicitly shared) copy so the cached palette can't be modified.
+        """
+        palette = cls._palette_cache.get(theme_name)
+        if palette is None:
+            colors = cls.get_theme_colors(theme_name)
+            palette = QPalette()
+            palette.setColor(QPalette.Window, QColor(colors["primary"]))
+            palette.setColor(QPalette.WindowText, QColor(colors["primary_text"]))
+            palette.setColor(QPalette.Base, QColor(colors["secondary_bg"]))
+            palette.setColor(QPalette.AlternateBase, QColor(colors["tertiary"]))
+            palette.setColor(QPalette.Text, QColor(colors["primary_text"]))
+            palette.setColor(QPalette.Button, QColor(colors["primary_btn"]))
+            palette.setColor(QPalette.ButtonText, QColor(colors["primary_text"]))
+            cls._palette_cache[theme_name] = palette
+        return QPalette(palette)
+
+    @classmethod
+    def _get_stylesheet(cls, theme_name: str):
+        """
+        Return the stylesheet for a theme, generating it only once per theme.
+        """
+        stylesheet = cls._stylesheet_cache.get(theme_name)
+        if stylesheet is None:
+            stylesheet = cls._generate_stylesheet(cls.get_theme_colors(theme_name))
+            cls._stylesheet_cache[theme_name] = stylesheet
+        return stylesheet
 
     @staticmethod
     def _generate_stylesheet(colors):